@@ -11,6 +11,7 @@ from __future__ import absolute_import, division, print_function
 
 import sys
 import warnings
+from collections import OrderedDict
 
 from astropy.table import Table
 from astropy.wcs import WCS
@@ -21,11 +22,11 @@ from ginga.gw import Widgets
 from ginga.misc.Datasrc import Datasrc
 from ginga.misc.Callback import Callbacks
 from ginga.table import AstroTable
-from ginga.util.six.moves import map
 
 from glue.core import Data
 from glue.core.coordinates import WCSCoordinates
-from glue.core.message import (DataCollectionAddMessage,
+from glue.core.message import (DataCollectionMessage,
+                               DataCollectionAddMessage,
                                DataCollectionDeleteMessage,
                                ApplicationClosedMessage)
 from glue.core.hub import HubListener
@@ -33,59 +34,145 @@ from glue.utils.error import GlueDeprecationWarning
 
 help_msg = sys.modules[__name__].__doc__
 
+_INSTRUCTIONS_TXT = """This plugin enables interface with Glue.
+
+Press "Start Glue" to start a new Glue session. Glue started independently (without using this button) does not work with this plugin. Glue started this way is tied to the Ginga session; i.e., closing Ginga will also close Glue.
+
+Press "Stop Glue" to end the Glue session without closing the plugin. This might not work correctly if there are multiple Glue sessions. This is unnecessary if Glue is already closed, e.g., by pressing "X" in Glue.
+
+To send an image or table to Glue, make it the currently active image/table and press "Put Data". Then switch to the Glue application to interact with it.
+
+To get an image or table from Glue to the currently active channel, select the associated name from the drop-down menu and then press "Get Data". If there is already an image with the same name in the Ginga channel, it will be overwritten.
+
+Press "Close" to close this plugin. This also closes the associated Glue session, if not already."""  # noqa
+
 __all__ = ['Glue']
 
 
+class _DeferredTable(object):
+    """Stand-in for Glue table data that has not been converted yet."""
+
+    def __init__(self, data):
+        self.data = data
+
+
 class GingaHubListener(Callbacks, HubListener):
     """
     Acts as a bridge between the Glue data collection hub and ginga callbacks.
     """
 
-    def __init__(self, datasrc):
+    def __init__(self, datasrc, fv=None):
         super(GingaHubListener, self).__init__()
 
         self.datasrc = datasrc
+        # If a ginga shell is given, data conversion is done off the GUI
+        # thread; name -> data for conversions still in flight
+        self.fv = fv
+        self._pending = {}
+        # name -> Glue data object that the datasrc entry was made from
+        self._sources = {}
 
         for cbname in ['data_in', 'data_out', 'app_closed']:
             self.enable_callback(cbname)
 
     def connect_hub(self, hub):
-        hub.subscribe(self, DataCollectionAddMessage,
-                      self._data_added_cb)
-        hub.subscribe(self, DataCollectionDeleteMessage,
-                      self._data_removed_cb)
+        # one subscription covers both add and delete messages
+        hub.subscribe(self, DataCollectionMessage,
+                      self._data_collection_cb)
 
         # This needs https://github.com/glue-viz/glue/pull/1168
         hub.subscribe(self, ApplicationClosedMessage,
                       self._app_closed_cb)
 
+    def _data_collection_cb(self, msg):
+        if isinstance(msg, DataCollectionAddMessage):
+            self._data_added_cb(msg)
+        elif isinstance(msg, DataCollectionDeleteMessage):
+            self._data_removed_cb(msg)
+
     def _data_added_cb(self, msg):
         data = msg.data
         name = data.label
+        if self._pending.get(name) is data or (
+                name in self.datasrc and self._sources.get(name) is data):
+            # repeated add for data that is converted or being converted
+            return
+
+        if data.ndim == 1:
+            # tables are only built if somebody actually asks for them
+            self._pending.pop(name, None)
+            self._store(name, data, _DeferredTable(data))
+            return
+
+        if self.fv is None:
+            self._finish_add(name, data, self._convert_data(data))
+            return
+
+        self._pending[name] = data
+        self.fv.nongui_do(self._convert_data_bg, name, data)
+
+    def _convert_data_bg(self, name, data):
+        # runs in a ginga worker thread--do not touch widgets here
+        try:
+            image = self._convert_data(data)
+        except Exception as e:
+            self.fv.logger.error("Error converting Glue data '%s': %s" % (
+                name, str(e)))
+            image = None
+        self.fv.gui_do(self._finish_add, name, data, image)
+
+    def _finish_add(self, name, data, image):
+        if self.fv is not None:
+            if self._pending.get(name) is not data:
+                # removed or replaced while it was being converted
+                return
+            del self._pending[name]
+
+        if image is None:
+            return
+        self._store(name, data, image)
+
+    def _store(self, name, data, image):
+        self.datasrc[name] = image
+        self._sources[name] = data
+        self.make_callback('data_in', image, name)
+
+    def _convert_data(self, data):
         if data.ndim == 1:
             image = self._data_to_table(data)
         else:
             image = self._data_to_image(data)
-        image.set(name=name)
-        self.datasrc[name] = image
-        self.make_callback('data_in', image)
+        image.set(name=data.label)
+        return image
 
     def _data_removed_cb(self, msg):
         data = msg.data
         name = data.label
+        if self._pending.pop(name, None) is not None:
+            # conversion still in flight, so it never reached datasrc
+            return
+        self._sources.pop(name, None)
+        if name not in self.datasrc:
+            # conversion failed earlier, so there is nothing to remove
+            return
         image = self.datasrc.remove(name)
-        self.make_callback('data_out', image)
+        self.make_callback('data_out', image, name)
 
     def _app_closed_cb(self, msg):
         self.make_callback('app_closed', None)
 
     def get_data(self, name):
-        return self.datasrc[name]
+        dataobj = self.datasrc[name]
+        if isinstance(dataobj, _DeferredTable):
+            dataobj = self._convert_data(dataobj.data)
+            self.datasrc[name] = dataobj
+        return dataobj
 
     @staticmethod
     def _data_to_image(data):
         ids = data.component_ids()
-        data_np = data[ids[0]]
+        # share the component buffer rather than materializing a copy
+        data_np = data.get_component(ids[0]).data
         data_meta = {}
 
         if hasattr(data.coords, 'header'):
@@ -93,23 +180,29 @@ class GingaHubListener(Callbacks, HubListener):
             h.update(data.coords.header)
             data_meta['header'] = h
 
+        # AstroImage loads its WCS from the header passed in the metadata,
+        # so only serialize the Glue WCS if there was no header to reuse
         image = AstroImage.AstroImage(data_np=data_np, metadata=data_meta)
 
-        if hasattr(data.coords, 'wcs'):
+        if 'header' not in data_meta and hasattr(data.coords, 'wcs'):
             image.wcs.load_header(data.coords.wcs.to_header())
 
         return image
 
     @staticmethod
     def _data_to_table(data):
-        tab = Table()
-
+        # derived components may repeat a label; as with assigning columns
+        # one by one, the last one wins but keeps the first one's place
+        cols = OrderedDict()
         for cid in data.visible_components:
             comp = data.get_component(cid)
             if comp.categorical:
-                tab[cid.label] = comp.labels
+                cols[cid.label] = comp.labels
             else:
-                tab[cid.label] = comp.data
+                cols[cid.label] = comp.data
+
+        # build in one go and share the component buffers
+        tab = Table(list(cols.values()), names=list(cols.keys()), copy=False)
 
         return AstroTable.AstroTable(data_ap=tab)
 
@@ -117,17 +210,30 @@ class GingaHubListener(Callbacks, HubListener):
 class Glue(GingaPlugin.GlobalPlugin):
     """Glue global plugin for Ginga reference viewer."""
 
+    # font for the instructions, shared by all instances of the plugin
+    _msg_font = None
+
     def __init__(self, fv):
         # superclass defines some variables for us, like logger
         super(Glue, self).__init__(fv)
 
         self.glue_app = None
-        self.glue_hl = GingaHubListener(Datasrc(length=0))
+        self.glue_hl = GingaHubListener(Datasrc(length=0), fv=fv)
         self.glue_hl.add_callback('data_in', self.data_added_cb)
         self.glue_hl.add_callback('data_out', self.data_removed_cb)
         self.glue_hl.add_callback('app_closed', self.app_closed_cb)
 
+        # combobox entries in order, and the reverse mapping label -> index
         self.data_names = []
+        self._index_by_label = {}
+
+        # bursts of add/remove events (e.g. loading a Glue session) are
+        # collected here and applied to the data list in one go
+        self._pending_items = []
+        self.refresh_delay = 0.05
+        self.refresh_timer = fv.get_timer()
+        self.refresh_timer.set_callback('expired', self._refresh_timer_cb)
+
         self.gui_up = False
 
     def build_gui(self, container):
@@ -139,11 +245,15 @@ class Glue(GingaPlugin.GlobalPlugin):
         vbox.set_border_width(4)
         vbox.set_spacing(2)
 
-        self.msg_font = self.fv.get_font("sansFont", 12)
+        if Glue._msg_font is None:
+            Glue._msg_font = self.fv.get_font("sansFont", 12)
+        self.msg_font = Glue._msg_font
         tw = Widgets.TextArea(wrap=True, editable=False)
         tw.set_font(self.msg_font)
         self.tw = tw
 
+        self.instructions()
+
         fr = Widgets.Expander("Instructions")
         fr.set_widget(tw)
         vbox.add_widget(fr, stretch=0)
@@ -197,17 +307,7 @@ class Glue(GingaPlugin.GlobalPlugin):
         self.gui_up = True
 
     def instructions(self):
-        self.tw.set_text("""This plugin enables interface with Glue.
-
-Press "Start Glue" to start a new Glue session. Glue started independently (without using this button) does not work with this plugin. Glue started this way is tied to the Ginga session; i.e., closing Ginga will also close Glue.
-
-Press "Stop Glue" to end the Glue session without closing the plugin. This might not work correctly if there are multiple Glue sessions. This is unnecessary if Glue is already closed, e.g., by pressing "X" in Glue.
-
-To send an image or table to Glue, make it the currently active image/table and press "Put Data". Then switch to the Glue application to interact with it.
-
-To get an image or table from Glue to the currently active channel, select the associated name from the drop-down menu and then press "Get Data". If there is already an image with the same name in the Ginga channel, it will be overwritten.
-
-Press "Close" to close this plugin. This also closes the associated Glue session, if not already.""")  # noqa
+        self.tw.set_text(_INSTRUCTIONS_TXT)
 
     def error_no_glue(self, verbose=True):
         """Call this to reset GUI when Glue session disappears."""
@@ -217,6 +317,8 @@ Press "Close" to close this plugin. This also closes the associated Glue session
         self.w.get_data.set_enabled(False)
         self.w.dataitem.clear()
         self.data_names = []
+        self._index_by_label = {}
+        self._pending_items = []
         if verbose:
             self.fv.show_error("No glue session running!")
 
@@ -243,9 +345,7 @@ Press "Close" to close this plugin. This also closes the associated Glue session
             # Pass in WCS for image.
             if isinstance(image, AstroImage.AstroImage):
                 gdata = Data(**kwargs)
-                h = image.get_header()
-                w = WCS(h)
-                gdata.coords = WCSCoordinates(h, wcs=w)
+                gdata.coords = self._get_coords(image)
                 self.glue_app.add_data(**{name: gdata})
             # Table data
             else:
@@ -257,6 +357,15 @@ Press "Close" to close this plugin. This also closes the associated Glue session
             self.fv.show_error("Error sending data to Glue: %s" % (str(e)))
             self.error_no_glue()
 
+    def _get_coords(self, image):
+        """Return Glue coordinates for ``image``, reusing its parsed WCS."""
+        h = image.get_header()
+        # ginga's astropy WCS wrapper has already parsed the header
+        w = getattr(image.wcs, 'wcs', None)
+        if not isinstance(w, WCS):
+            w = WCS(h)
+        return WCSCoordinates(h, wcs=w)
+
     def get_data_cb(self):
         if self.glue_app is None:
             self.error_no_glue()
@@ -269,33 +378,128 @@ Press "Close" to close this plugin. This also closes the associated Glue session
             return
 
         idx = self.w.dataitem.get_index()
+        if not 0 <= idx < len(self.data_names):
+            self.fv.show_error("No Glue data selected!")
+            return
         name = self.data_names[idx]
-        dataobj = self.glue_hl.get_data(name)
+        if name not in self.glue_hl.datasrc:
+            self.fv.show_error("Glue data '%s' is not available" % (name))
+            return
+        try:
+            # tables are only converted now, on first request
+            dataobj = self.glue_hl.get_data(name)
+        except Exception as e:
+            self.fv.show_error("Error converting Glue data '%s': %s" % (
+                name, str(e)))
+            return
 
         channel.add_image(dataobj)
 
     def _adj_data_list(self):
         # adjust available items list
         dc = self.glue_app.data_collection
-        self.w.dataitem.clear()
 
-        self.data_names = list(map(lambda data: data.label, dc.data))
+        self._pending_items = []
+        # only list data that has been converted; data still being
+        # converted is added by data_added_cb once it is ready
+        datasrc = self.glue_hl.datasrc
+        self.data_names = [data.label for data in dc.data
+                           if data.label in datasrc]
+        self._index_by_label = dict((name, idx) for idx, name
+                                    in enumerate(self.data_names))
+
+        self._set_data_items(self.data_names)
 
         if len(self.data_names) == 0:
             self.w.get_data.set_enabled(False)
             return
 
-        for name in self.data_names:
-            self.w.dataitem.append_text(name)
-
         self.w.dataitem.set_index(0)
         self.w.get_data.set_enabled(True)
 
-    def data_added_cb(self, hub, dataobj):
-        self._adj_data_list()
+    def _set_data_items(self, names):
+        """Replace all entries of the data item combobox."""
+        widget = self.w.dataitem.get_widget()
+        if hasattr(widget, 'setModel'):
+            # Qt backend: swap in a new model rather than creating an item
+            # per entry (the old model is owned by the combobox and freed).
+            # Imported here so that the plugin still loads on other toolkits
+            from ginga.qtw.QtHelp import QtCore
+            widget.setModel(QtCore.QStringListModel(list(names), widget))
+        else:
+            self.w.dataitem.clear()
+            self._append_data_items(names)
+
+    def _append_data_items(self, names):
+        """Append several names to the data item combobox at once."""
+        widget = self.w.dataitem.get_widget()
+        if hasattr(widget, 'addItems'):
+            # Qt backend: one model update instead of one per item
+            widget.addItems(names)
+        else:
+            for name in names:
+                self.w.dataitem.append_text(name)
+
+    def _add_data_items(self, names):
+        # incrementally add items to the available items list
+        was_empty = len(self.data_names) == 0
+        new_names = []
+        for name in names:
+            if name in self._index_by_label:
+                continue
+            self._index_by_label[name] = len(self.data_names)
+            self.data_names.append(name)
+            new_names.append(name)
+
+        if len(new_names) == 0:
+            return
+        self._append_data_items(new_names)
+
+        if was_empty:
+            self.w.dataitem.set_index(0)
+            self.w.get_data.set_enabled(True)
+
+    def _remove_data_item(self, name):
+        # incrementally remove one item from the available items list
+        idx = self._index_by_label.pop(name, None)
+        if idx is None:
+            return
+        del self.data_names[idx]
+        # only the entries after the removed one shift down
+        for i in range(idx, len(self.data_names)):
+            self._index_by_label[self.data_names[i]] = i
+        self.w.dataitem.delete_alpha(name)
+
+        if len(self.data_names) == 0:
+            self.w.get_data.set_enabled(False)
+
+    def _schedule_refresh(self):
+        # (re)start the timer so a burst of events is applied only once
+        self.refresh_timer.set(self.refresh_delay)
+
+    def _refresh_timer_cb(self, timer):
+        self.fv.gui_do(self._flush_data_items)
+
+    def _flush_data_items(self):
+        items, self._pending_items = self._pending_items, []
+        added = []
+        for is_add, name in items:
+            if is_add:
+                added.append(name)
+            elif name in added:
+                added.remove(name)
+            else:
+                self._remove_data_item(name)
 
-    def data_removed_cb(self, hub, dataobj):
-        self._adj_data_list()
+        self._add_data_items(added)
+
+    def data_added_cb(self, hub, dataobj, name):
+        self._pending_items.append((True, name))
+        self._schedule_refresh()
+
+    def data_removed_cb(self, hub, dataobj, name):
+        self._pending_items.append((False, name))
+        self._schedule_refresh()
 
     def app_closed_cb(self, hub, dataobj):
         self.glue_app = None
@@ -337,8 +541,6 @@ Press "Close" to close this plugin. This also closes the associated Glue session
         print(dir(msg))
 
     def start(self):
-        self.instructions()
-
         if self.glue_app is not None:
             self.w.start_glue.set_enabled(False)
             self.w.stop_glue.set_enabled(True)
@@ -0,0 +1,181 @@
+from __future__ import absolute_import, division, print_function
+
+import logging
+
+import numpy as np
+import pytest
+
+pytest.importorskip('ginga')
+
+from ginga.gw import Widgets
+
+from ..Glue import Glue, GingaHubListener, _DeferredTable
+
+
+class FakeTimer(object):
+    """Timer that never expires by itself; tests flush explicitly."""
+
+    def set_callback(self, name, fn):
+        pass
+
+    def set(self, secs):
+        pass
+
+
+class FakeShell(object):
+    """The parts of the ginga reference viewer used by the plugin."""
+
+    def __init__(self):
+        self.logger = logging.getLogger('test_glue')
+        self.errors = []
+
+    def get_timer(self):
+        return FakeTimer()
+
+    def gui_do(self, fn, *args):
+        fn(*args)
+
+    def nongui_do(self, fn, *args):
+        fn(*args)
+
+    def show_error(self, msg):
+        self.errors.append(msg)
+
+    def get_current_channel(self):
+        return object()
+
+
+def combobox_items(plugin):
+    widget = plugin.w.dataitem.get_widget()
+    return [widget.itemText(i) for i in range(widget.count())]
+
+
+class TestDataItems(object):
+
+    def setup_method(self, method):
+        self.fv = FakeShell()
+        self.plugin = Glue(self.fv)
+        self.plugin.w.dataitem = Widgets.ComboBox()
+        self.plugin.w.get_data = Widgets.Button('Get Data')
+        self.plugin.w.get_data.set_enabled(False)
+
+    def add(self, *names):
+        for name in names:
+            self.plugin.data_added_cb(None, None, name)
+
+    def remove(self, *names):
+        for name in names:
+            self.plugin.data_removed_cb(None, None, name)
+
+    def check(self, names):
+        assert combobox_items(self.plugin) == names
+        assert self.plugin.data_names == names
+        assert self.plugin._index_by_label == dict(
+            (name, idx) for idx, name in enumerate(names))
+        assert self.plugin.w.get_data.get_widget().isEnabled() == bool(names)
+
+    def test_add(self):
+        self.add('a', 'b', 'c')
+        # nothing changes until the burst is flushed
+        self.check([])
+        self.plugin._flush_data_items()
+        self.check(['a', 'b', 'c'])
+        assert self.plugin.w.dataitem.get_index() == 0
+
+    def test_add_duplicate(self):
+        self.add('a', 'b')
+        self.plugin._flush_data_items()
+        self.add('b', 'c', 'c')
+        self.plugin._flush_data_items()
+        self.check(['a', 'b', 'c'])
+
+    def test_remove(self):
+        self.add('a', 'b', 'c', 'd')
+        self.plugin._flush_data_items()
+        self.remove('b')
+        self.plugin._flush_data_items()
+        self.check(['a', 'c', 'd'])
+        self.remove('d', 'a', 'unknown')
+        self.plugin._flush_data_items()
+        self.check(['c'])
+        self.remove('c')
+        self.plugin._flush_data_items()
+        self.check([])
+
+    def test_add_remove_in_one_burst(self):
+        self.add('a')
+        self.plugin._flush_data_items()
+        self.add('b', 'c')
+        self.remove('b', 'a')
+        self.plugin._flush_data_items()
+        self.check(['c'])
+
+    def test_remove_then_add(self):
+        # new names go at the end, also when one was just removed
+        self.add('a', 'b', 'c')
+        self.plugin._flush_data_items()
+        self.remove('a')
+        self.add('z')
+        self.plugin._flush_data_items()
+        self.check(['b', 'c', 'z'])
+        self.remove('z')
+        self.add('a')
+        self.plugin._flush_data_items()
+        self.check(['b', 'c', 'a'])
+
+    def test_get_unconverted_data(self):
+        # listed, but not (yet) in the hub listener's data source
+        self.plugin.glue_app = object()
+        self.add('a')
+        self.plugin._flush_data_items()
+        self.plugin.get_data_cb()
+        assert len(self.fv.errors) == 1
+
+    def test_get_data_conversion_error(self):
+        class BrokenData(object):
+            label = 'a'
+
+            @property
+            def visible_components(self):
+                raise ValueError("broken")
+
+        self.plugin.glue_app = object()
+        self.plugin.glue_hl.datasrc['a'] = _DeferredTable(BrokenData())
+        self.add('a')
+        self.plugin._flush_data_items()
+        self.plugin.get_data_cb()
+        assert len(self.fv.errors) == 1
+
+
+class FakeComponentID(object):
+
+    def __init__(self, label):
+        self.label = label
+
+
+class FakeComponent(object):
+    categorical = False
+
+    def __init__(self, values):
+        self.data = np.asarray(values)
+
+
+class FakeTableData(object):
+
+    def __init__(self, columns):
+        self.visible_components = [FakeComponentID(label)
+                                   for label, values in columns]
+        self._components = dict((cid, FakeComponent(values))
+                                for cid, (label, values)
+                                in zip(self.visible_components, columns))
+
+    def get_component(self, cid):
+        return self._components[cid]
+
+
+def test_data_to_table_duplicate_labels():
+    data = FakeTableData([('x', [1, 2]), ('y', [3, 4]), ('x', [5, 6])])
+    tab = GingaHubListener._data_to_table(data).get_data()
+    assert tab.colnames == ['x', 'y']
+    np.testing.assert_array_equal(tab['x'], [5, 6])
+    np.testing.assert_array_equal(tab['y'], [3, 4])
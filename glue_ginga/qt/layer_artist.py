@@ -1,6 +1,6 @@
 from __future__ import absolute_import, division, print_function
 
-from time import time
+from itertools import count
 
 import numpy as np
 from ginga.misc import Bunch
@@ -10,17 +10,27 @@ from ginga import AstroImage, BaseImage
 from glue.external.echo import keep_in_sync, CallbackProperty
 from glue.core.exceptions import IncompatibleAttribute
 from glue.core.layer_artist import LayerArtistBase
-from glue.utils import color2rgb
+from glue.utils import color2rgb, view_shape
 from glue.viewers.image.state import ImageLayerState, ImageSubsetLayerState
 
 wcsmod.use('astropy')
 
+# used to give each subset layer a unique canvas tag
+_tag_counter = count()
+
 
 class GingaLayerArtist(LayerArtistBase):
 
     zorder = CallbackProperty()
     visible = CallbackProperty()
 
+    # Properties that only affect how layers are composited, so changing
+    # them does not require the image data to be cut and colored again.
+    # 'visible' is not one of them: hiding a layer clears it without a
+    # redraw here, and a layer shown again must not reuse the cutout
+    # cached before it was hidden, which may be for an old pan or zoom.
+    _composite_props = ('zorder',)
+
     def __init__(self, viewer_state=None, layer=None, layer_state=None, canvas=None):
 
         super(GingaLayerArtist, self).__init__(layer)
@@ -46,12 +56,23 @@ class GingaLayerArtist(LayerArtistBase):
         self.state.add_global_callback(self.update)
         self._viewer_state.add_global_callback(self.update)
 
-    def clear(self):
-        self._canvas.delete_objects_by_tag([self._tag], redraw=True)
+    def clear(self, redraw=True):
+        self._canvas.delete_objects_by_tag([self._tag], redraw=False)
+        if redraw:
+            self.redraw(whence=3)
 
     def redraw(self, whence=0):
         self._canvas.redraw(whence=whence)
 
+    def _redraw_whence(self, changed):
+        """
+        Return the cheapest ginga redraw level for the changed properties.
+        """
+        if changed and all(name in self._composite_props for name in changed):
+            # only re-composite the cached layer cutouts
+            return 2
+        return 0
+
     def remove(self):
         self.clear()
 
@@ -59,12 +80,12 @@ class GingaLayerArtist(LayerArtistBase):
         return dict(state=context.id(self.state))
 
     def update(self, **kwargs):
-        try:
+        if self._canvas.has_tag(self._tag):
             canvas_img = self._canvas.get_object_by_tag(self._tag)
-        except KeyError:
-            pass
-        else:
-            canvas_img.set_zorder(self.state.zorder)
+            # set_zorder reorders and redraws immediately, so only call it
+            # when the zorder actually changed
+            if canvas_img.get_zorder() != self.state.zorder:
+                canvas_img.set_zorder(self.state.zorder)
 
 
 class GingaImageLayer(GingaLayerArtist):
@@ -83,22 +104,24 @@ class GingaImageLayer(GingaLayerArtist):
         """
         Add artist to canvas if needed
         """
-        try:
-            self._canvas.get_object_by_tag(self._tag)
-        except KeyError:
+        if not self._canvas.has_tag(self._tag):
             self._canvas.set_image(self._img)
 
     def update(self, **kwargs):
 
         super(GingaImageLayer, self).update(**kwargs)
 
+        if not kwargs:
+            # called by the viewer because the data changed
+            self._img.invalidate_cache()
+
         if self.state.visible and self._img:
             self._ensure_added()
         elif not self.state.visible:
             self.clear()
             return
 
-        self.redraw()
+        self.redraw(whence=self._redraw_whence(kwargs))
 
 
 class GingaSubsetImageLayer(GingaLayerArtist):
@@ -110,14 +133,27 @@ class GingaSubsetImageLayer(GingaLayerArtist):
         super(GingaSubsetImageLayer, self).__init__(viewer_state=viewer_state, layer=layer,
                                                     layer_state=layer_state, canvas=canvas)
 
-        self._tag = "layer%s_%s" % (layer.label, time())
+        self._tag = "layer%s_%d" % (layer.label, next(_tag_counter))
 
         self._img = SubsetImage(self.state)
 
-        # SubsetImages can't be added to canvases directly. Need
-        # to wrap into a ginga canvas type.
-        Image = self._canvas.get_draw_class('image')
-        self._cimg = Image(0, 0, self._img, alpha=0.5, flipy=False)
+        # (layer, subset state) ids for which _check_enabled last ran
+        self._enabled_key = None
+
+        # canvas object wrapping the image, made when first shown
+        self._cimg_obj = None
+
+        # view selecting the first pixel, used to test the subset
+        self._probe_view = ()
+
+    @property
+    def _cimg(self):
+        if self._cimg_obj is None:
+            # SubsetImages can't be added to canvases directly. Need
+            # to wrap into a ginga canvas type.
+            Image = self._canvas.get_draw_class('image')
+            self._cimg_obj = Image(0, 0, self._img, alpha=0.5, flipy=False)
+        return self._cimg_obj
 
     def _visible_changed(self, *args):
         if self.state.visible and self._cimg:
@@ -130,10 +166,17 @@ class GingaSubsetImageLayer(GingaLayerArtist):
         Sync the enabled/disabled status, based on whether
         mask is computable
         """
+        key = (id(self.layer), id(self.layer.subset_state))
+        if key == self._enabled_key:
+            return
+        self._enabled_key = key
+
         try:
             # Just try computing the subset for the first pixel
-            view = tuple(0 for _ in self.layer.data.shape)
-            self.layer.to_mask(view)
+            ndim = self.layer.data.ndim
+            if len(self._probe_view) != ndim:
+                self._probe_view = (0,) * ndim
+            self.layer.to_mask(self._probe_view)
         except IncompatibleAttribute as exc:
             self.disable_invalid_attributes(*exc.args)
             return
@@ -144,30 +187,51 @@ class GingaSubsetImageLayer(GingaLayerArtist):
         """
         Add artist to canvas if needed
         """
-        try:
-            self._canvas.get_object_by_tag(self._tag)
-        except KeyError:
+        if not self._canvas.has_tag(self._tag):
             self._canvas.add(self._cimg, tag=self._tag, redraw=False)
 
     def update(self, **kwargs):
 
         super(GingaSubsetImageLayer, self).update(**kwargs)
 
+        if not kwargs:
+            # called by the viewer because the subset or data changed
+            self._img.invalidate_cache()
+            self._enabled_key = None
+
         self._check_enabled()
 
+        if not self.enabled:
+            # the mask can't be computed, so there is nothing to draw
+            self.clear()
+            return
+
         if self.state.visible and self._img:
             self._ensure_added()
         elif not self.state.visible:
             self.clear()
             return
 
-        self.redraw(whence=0)
+        self.redraw(whence=self._redraw_whence(kwargs))
 
 
 def forbidden(*args):
     raise ValueError("Forbidden")
 
 
+def _slice_state_key(layer_state):
+    """
+    Return a key identifying the 2D data currently extracted for a layer.
+    """
+    # ids are used for glue objects since ComponentID overloads ==
+    layer = layer_state.layer
+    viewer_state = layer_state.viewer_state
+    return (id(layer), id(getattr(layer, 'subset_state', None)),
+            id(getattr(layer_state, 'attribute', None)),
+            id(viewer_state.reference_data), id(viewer_state.x_att),
+            id(viewer_state.y_att), tuple(viewer_state.slices or ()))
+
+
 class DataImage(AstroImage.AstroImage):
     """
     A Ginga image subclass to interface with Glue Data objects
@@ -184,6 +248,10 @@ class DataImage(AstroImage.AstroImage):
             Extra kwargs are passed to the superclass
         """
         self.layer_state = layer_state
+
+        # (key, array) of the last slice, see _slice()
+        self._cache = None
+
         super(DataImage, self).__init__(**kwargs)
 
     @property
@@ -193,6 +261,12 @@ class DataImage(AstroImage.AstroImage):
         """
         return self.layer_state.get_sliced_data_shape()
 
+    def invalidate_cache(self):
+        """
+        Forget extracted data, e.g. because the data values changed.
+        """
+        self._cache = None
+
     def _get_fast_data(self):
         return self._slice((slice(None, None, 10), slice(None, None, 10)))
 
@@ -200,7 +274,16 @@ class DataImage(AstroImage.AstroImage):
         """
         Extract a view from the 2D image.
         """
-        return self.layer_state.get_sliced_data(view=view)
+        # glue re-extracts the plane on every call, and the same view is
+        # asked for again by callbacks that do not change the slicing
+        key = (view,) + _slice_state_key(self.layer_state)
+        if self._cache is not None and self._cache[0] == key:
+            return self._cache[1]
+
+        result = self.layer_state.get_sliced_data(view=view)
+
+        self._cache = (key, result)
+        return result
 
 
 class SubsetImage(BaseImage.BaseImage):
@@ -219,6 +302,11 @@ class SubsetImage(BaseImage.BaseImage):
         """
         self.layer_state = layer_state
 
+        # (key, RGBA array) of the last slice, see _slice()
+        self._cache = None
+        # (color, packed pixels) for the last layer color, see _pixels()
+        self._pixel_cache = (None, None)
+
         # NOTE: BaseImage accesses shape property--we need above items
         # defined because we override shape()
         super(SubsetImage, self).__init__(**kwargs)
@@ -231,15 +319,34 @@ class SubsetImage(BaseImage.BaseImage):
         """
         return self.layer_state.get_sliced_data_shape()
 
+    def _pixels(self):
+        """
+        Return the packed transparent and half opaque RGBA pixels of the
+        layer color.
+        """
+        color = self.layer_state.color
+        if self._pixel_cache[0] != color:
+            r, g, b = color2rgb(color)
+            lut = np.array([[r * 255, g * 255, b * 255, 0],
+                            [r * 255, g * 255, b * 255, 127]]).astype(np.uint8)
+            self._pixel_cache = (color, tuple(lut.view(np.uint32).ravel()))
+        return self._pixel_cache[1]
+
     def _rgb_from_mask(self, mask):
         """
         Turn a boolean mask into a 4-channel RGBA image
         """
-        r, g, b = color2rgb(self.layer_state.color)
-        ones = mask * 0 + 255
-        alpha = mask * 127
-        result = np.dstack((ones * r, ones * g, ones * b, alpha)).astype(np.uint8)
-        return result
+        off, on = self._pixels()
+        # a scalar mask is a single pixel, as np.dstack would make it
+        mask = np.atleast_2d(np.asarray(mask, dtype=bool))
+        # the two pixels differ only in the alpha byte, so the 0/1 mask
+        # times that difference plus the transparent pixel packs every
+        # pixel without a gather. The output is allocated in C order since
+        # the mask may be a transposed view, and ginga wants contiguous RGBA
+        result = np.empty(mask.shape, dtype=np.uint32)
+        np.multiply(mask.view(np.uint8), on - off, out=result)
+        result += off
+        return result.view(np.uint8).reshape(mask.shape + (4,))
 
     def _get_fast_data(self):
         return self._slice((slice(None, None, 10), slice(None, None, 10)))
@@ -249,14 +356,39 @@ class SubsetImage(BaseImage.BaseImage):
         # access the data type of the image--we can instead assume RGBA
         self.order = 'RGBA'
 
+    def _slice_mask(self, view):
+        """
+        Extract a view from the 2D subset mask, as a single boolean channel.
+        """
+        return self.layer_state.get_sliced_data(view=view)
+
+    def invalidate_cache(self):
+        """
+        Forget the cached slice, e.g. because the subset or data changed.
+        """
+        self._cache = None
+
+    def _cache_key(self, view):
+        return ((view, self.layer_state.color) +
+                _slice_state_key(self.layer_state))
+
     def _slice(self, view):
         """
         Extract a view from the 2D subset mask.
         """
+        key = self._cache_key(view)
+        if self._cache is not None and self._cache[0] == key:
+            return self._cache[1]
+
         try:
-            return self._rgb_from_mask(self.layer_state.get_sliced_data(view=view))
+            result = self._rgb_from_mask(self._slice_mask(view))
         except IncompatibleAttribute:
-            return np.zeros(self.shape + (4,))
+            # fully transparent, one byte per channel, only as big as view
+            return np.zeros(view_shape(self.shape, view) + (4,),
+                            dtype=np.uint8)
+
+        self._cache = (key, result)
+        return result
 
     def _set_minmax(self):
         # we already know the data bounds
@@ -278,12 +410,17 @@ class SubsetImage(BaseImage.BaseImage):
         x1, x2 = np.clip([x1, x2], 0, self.width - 2).astype(np.int)
         y1, y2 = np.clip([y1, y2], 0, self.height - 2).astype(np.int)
 
-        result = self._slice(np.s_[y1:y2 + 1, x1:x2 + 1])
+        # resample the single-channel mask and only expand the final
+        # cutout to RGBA, rather than resampling four channels
+        try:
+            mask = self._slice_mask(np.s_[y1:y2 + 1, x1:x2 + 1])
+        except IncompatibleAttribute:
+            mask = np.zeros((y2 - y1 + 1, x2 - x1 + 1), dtype=bool)
 
-        yi = np.linspace(0, result.shape[0], new_ht).astype(np.int).reshape(-1, 1).clip(0, result.shape[0] - 1)
-        xi = np.linspace(0, result.shape[1], new_wd).astype(np.int).reshape(1, -1).clip(0, result.shape[1] - 1)
+        yi = np.linspace(0, mask.shape[0], new_ht).astype(np.int).reshape(-1, 1).clip(0, mask.shape[0] - 1)
+        xi = np.linspace(0, mask.shape[1], new_wd).astype(np.int).reshape(1, -1).clip(0, mask.shape[1] - 1)
         yi, xi = [np.array(a) for a in np.broadcast_arrays(yi, xi)]
-        result = result[yi, xi]
+        result = self._rgb_from_mask(mask[yi, xi])
 
         scale_x = 1.0 * result.shape[1] / (x2 - x1 + 1)
         scale_y = 1.0 * result.shape[0] / (y2 - y1 + 1)
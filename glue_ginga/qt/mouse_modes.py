@@ -4,6 +4,8 @@ import os
 import sys
 
 from ginga import cmap as ginga_cmap
+from ginga.AutoCuts import get_autocuts_names
+from ginga.ColorDist import get_dist_names
 
 from qtpy import QtGui, QtWidgets
 from glue.config import viewer_tool
@@ -23,6 +25,30 @@ GINGA_ICON_DIR = os.path.join(GINGA_HOME, 'icons')
 # TODO: glue menu seems extremely slow if we add them all
 #ginga_cmap.add_matplotlib_cmaps(fail_on_import_error=False)
 
+# names offered in the cuts and distribution menus ('clip' is not
+# relevant to glue)
+_AUTOCUT_NAMES = [name for name in get_autocuts_names() if name != 'clip']
+_DIST_NAMES = list(get_dist_names())
+
+# colormap name -> QIcon, so menus do not render the same pixmaps again
+_CMAP_ICON_CACHE = {}
+
+
+def _cmap_icon(label, cmap):
+    icon = _CMAP_ICON_CACHE.get(label)
+    if icon is None:
+        icon = QtGui.QIcon(cmap2pixmap(cmap))
+        _CMAP_ICON_CACHE[label] = icon
+    return icon
+
+
+# drawing styles passed to the canvas when a drawing tool is selected
+_ROI_DRAW_STYLE = dict(color='cyan', linewidth=2, linestyle='dash',
+                       fill=True, fillcolor='yellow', fillalpha=0.5)
+_PATH_STYLE = dict(color='cyan', linewidth=2, linestyle='dash')
+_RANGE_STYLE = dict(fillcolor='cyan', fillalpha=0.5, linewidth=0)
+_EXTRACT_STYLE = dict(color='red', linewidth=2, linestyle='solid',
+                      fill=False, alpha=1.0)
 
 class GingaROIMode(CheckableTool):
 
@@ -30,12 +56,10 @@ class GingaROIMode(CheckableTool):
         """This method is called when the user clicks down to draw an object.
         It gets called with any previously drawn object that was kept (or None).
         """
-        if tag is not None:
-            try:
-                # typical case for a ROI is delete any existing shape
-                viewer.canvas.delete_object_by_tag(tag)
-            except:
-                pass
+        if tag is not None and viewer.canvas.has_tag(tag):
+            # typical case for a ROI is delete any existing shape; the
+            # canvas is redrawn anyway as the new shape is drawn
+            viewer.canvas.delete_object_by_tag(tag, redraw=False)
 
         return None
 
@@ -45,13 +69,16 @@ class GingaROIMode(CheckableTool):
         on the canvas and `obj` is the actual shape.
         """
 
-        # typical case is we want to remove the shape we just drew
-        # from the canvas because we will be replacing it with a ROI
-        viewer.canvas.delete_object_by_tag(tag, redraw=False)
+        # hold ginga's redraws until the ROI is applied, so that removing
+        # the outline and updating the layers cost a single redraw
+        with viewer.viewer.suppress_redraw:
+            # typical case is we want to remove the shape we just drew
+            # from the canvas because we will be replacing it with a ROI
+            viewer.canvas.delete_object_by_tag(tag)
 
-        roi = ginga_graphic_to_roi(obj)
+            roi = ginga_graphic_to_roi(obj)
 
-        viewer.apply_roi(roi)
+            viewer.apply_roi(roi)
 
 
 class GingaPathMode(GingaROIMode):
@@ -67,9 +94,7 @@ class RectangleROIMode(GingaROIMode):
     tool_tip = 'Define a rectangular region of interest'
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'rectangle', 'draw',
-                                  color='cyan', linewidth=2, linestyle='dash',
-                                  fill=True, fillcolor='yellow', fillalpha=0.5)
+        self.viewer._set_roi_mode(self, 'rectangle', 'draw', **_ROI_DRAW_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'rectangle', None)
@@ -84,9 +109,7 @@ class CircleROIMode(GingaROIMode):
     tool_tip = 'Define a circular region of interest'
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'circle', 'draw',
-                                  color='cyan', linewidth=2, linestyle='dash',
-                                  fill=True, fillcolor='yellow', fillalpha=0.5)
+        self.viewer._set_roi_mode(self, 'circle', 'draw', **_ROI_DRAW_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'circle', None)
@@ -107,9 +130,7 @@ class PolygonROIMode(GingaROIMode):
                   'polygon vertex, "z" to remove last added vertex')
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'polygon', 'draw',
-                                  color='cyan', linewidth=2, linestyle='dash',
-                                  fill=True, fillcolor='yellow', fillalpha=0.5)
+        self.viewer._set_roi_mode(self, 'polygon', 'draw', **_ROI_DRAW_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'polygon', None)
@@ -127,9 +148,7 @@ class LassoROIMode(GingaROIMode):
     status_tip = ('CLICK and DRAG to start lassoing')
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'freepolygon', 'draw',
-                                  color='cyan', linewidth=2, linestyle='dash',
-                                  fill=True, fillcolor='yellow', fillalpha=0.5)
+        self.viewer._set_roi_mode(self, 'freepolygon', 'draw', **_ROI_DRAW_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'freepolygon', None)
@@ -149,8 +168,7 @@ class PathROIMode(GingaROIMode):
                   'path vertex, "z" to remove last added vertex')
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'path', 'draw',
-                                  color='cyan', linewidth=2, linestyle='dash')
+        self.viewer._set_roi_mode(self, 'path', 'draw', **_PATH_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'path', None)
@@ -170,9 +188,7 @@ class HRangeMode(GingaROIMode):
     tool_tip = 'Select a range of x values'
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'xrange', 'draw',
-                                  fillcolor='cyan', fillalpha=0.5,
-                                  linewidth=0)
+        self.viewer._set_roi_mode(self, 'xrange', 'draw', **_RANGE_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'xrange', None)
@@ -192,9 +208,7 @@ class VRangeMode(GingaROIMode):
     tool_tip = 'Select a range of y values'
 
     def activate(self):
-        self.viewer._set_roi_mode(self, 'yrange', 'draw',
-                                  fillcolor='cyan', fillalpha=0.5,
-                                  linewidth=0)
+        self.viewer._set_roi_mode(self, 'yrange', 'draw', **_RANGE_STYLE)
 
     def deactivate(self):
         self.viewer._set_roi_mode(None, 'yrange', None)
@@ -317,6 +331,14 @@ class CutsMode(CheckableTool):
     status_tip = ('CLICK and DRAG to set cut levels; horizontally to set low'
                   ' cut level, vertically to set high cut level')
 
+    # menu actions, built on first request
+    _cached_actions = None
+
+    # location of the cut levels dialog and the validator for its fields,
+    # shared by all viewers
+    _ui_directory = None
+    _validator = None
+
     def activate(self):
         self.viewer.mode_cb('cuts', True)
 
@@ -341,12 +363,14 @@ class CutsMode(CheckableTool):
 
     def choose_vmin_vmax(self):
         # Following example of glue matplotlib viewer
-        from glue.viewers.common.qt import mouse_mode
+        if CutsMode._ui_directory is None:
+            from glue.viewers.common.qt import mouse_mode
+            CutsMode._ui_directory = os.path.dirname(mouse_mode.__file__)
+            CutsMode._validator = QtGui.QDoubleValidator()
         dialog = load_ui('contrastlimits.ui', None,
-                         directory=os.path.dirname(mouse_mode.__file__))
-        v = QtGui.QDoubleValidator()
-        dialog.vmin.setValidator(v)
-        dialog.vmax.setValidator(v)
+                         directory=CutsMode._ui_directory)
+        dialog.vmin.setValidator(CutsMode._validator)
+        dialog.vmax.setValidator(CutsMode._validator)
 
         vmin, vmax = self.get_vmin_vmax()
         if vmin is not None:
@@ -370,7 +394,9 @@ class CutsMode(CheckableTool):
         dialog.exec_()
 
     def menu_actions(self):
-        from ginga.AutoCuts import get_autocuts_names
+        if self._cached_actions is not None:
+            return self._cached_actions
+
         result = []
 
         a = QtWidgets.QAction("autocuts", None)
@@ -385,12 +411,7 @@ class CutsMode(CheckableTool):
         a.setSeparator(True)
         result.append(a)
 
-        names = list(get_autocuts_names())
-        if 'clip' in names:
-            # not relevant to glue
-            names.remove('clip')
-
-        for name in names:
+        for name in _AUTOCUT_NAMES:
             a = QtWidgets.QAction(name, None)
             a.triggered.connect(nonpartial(self.set_autocuts, name))
             result.append(a)
@@ -399,6 +420,7 @@ class CutsMode(CheckableTool):
         ## #rng.triggered.connect(nonpartial(self.choose_vmin_vmax))
         ## result.append(rng)
 
+        self._cached_actions = result
         return result
 
 
@@ -409,6 +431,9 @@ class DistributionMode(CheckableTool):
     icon = os.path.join(GINGA_ICON_DIR, 'histogram_48.png')
     tool_tip = ('Adjust value distribution of the image')
 
+    # menu actions, built on first request
+    _cached_actions = None
+
     def activate(self):
         self.viewer.mode_cb('dist', True)
 
@@ -420,24 +445,28 @@ class DistributionMode(CheckableTool):
         gviewer.set_color_algorithm(name)
 
     def menu_actions(self):
-        from ginga.ColorDist import get_dist_names
+        if self._cached_actions is not None:
+            return self._cached_actions
+
         result = []
 
-        for algname in get_dist_names():
+        for algname in _DIST_NAMES:
             a = QtWidgets.QAction(algname, None)
             a.triggered.connect(nonpartial(self.set_dist, algname))
             result.append(a)
 
+        self._cached_actions = result
         return result
 
 
 class ColormapAction(QtWidgets.QAction):
 
-    def __init__(self, label, cmap, parent):
+    def __init__(self, label, cmap, parent, icon=None):
         super(ColormapAction, self).__init__(label, parent)
         self.cmap = cmap
-        pm = cmap2pixmap(cmap)
-        self.setIcon(QtGui.QIcon(pm))
+        if icon is None:
+            icon = QtGui.QIcon(cmap2pixmap(cmap))
+        self.setIcon(icon)
 
 
 @viewer_tool
@@ -458,7 +487,8 @@ class ColormapMode(CheckableTool):
         acts = []
         for label in ginga_cmap.get_names():
             cmap = ginga_cmap.get_cmap(label)
-            a = ColormapAction(label, cmap, self.viewer)
+            a = ColormapAction(label, cmap, self.viewer,
+                               icon=_cmap_icon(label, cmap))
             a.triggered.connect(nonpartial(self.viewer.set_cmap, cmap))
             acts.append(a)
         return acts
@@ -480,9 +510,17 @@ class GingaSpectrumMode(GingaROIMode):
 
         self.viewer.state.add_callback('reference_data', self._display_data_hook)
 
-        self._tool = SpectrumTool(self.viewer, self)
+        # the spectrum tool builds its own widgets and figure, so it is only
+        # created once a spectrum is actually extracted
+        self._tool = None
         #self._move_callback = self._tool._move_profile
 
+    @property
+    def tool(self):
+        if self._tool is None:
+            self._tool = SpectrumTool(self.viewer, self)
+        return self._tool
+
     def _display_data_hook(self, data):
         if data is not None:
             self.enabled = data.ndim == 3
@@ -511,9 +549,7 @@ class GingaSpectrumMode(GingaROIMode):
 
     def set_roi_tool(self, mode):
         self._shape = mode
-        self.viewer._set_roi_mode(self, mode, 'draw',
-                                  color='red', linewidth=2, linestyle='solid',
-                                  fill=False, alpha=1.0)
+        self.viewer._set_roi_mode(self, mode, 'draw', **_EXTRACT_STYLE)
 
     def activate(self):
         self.set_roi_tool(self._shape)
@@ -530,19 +566,18 @@ class GingaSpectrumMode(GingaROIMode):
         self._shape_obj = obj
 
         roi = ginga_graphic_to_roi(obj)
-        self._tool._update_from_roi(roi)
+        self.tool._update_from_roi(roi)
 
     def clear(self):
         if self._shape_obj is not None:
-            try:
-                self.viewer.canvas.delete_object(self._shape_obj)
-            except:
-                pass
+            # a no-op if the shape was already removed from the canvas
+            self.viewer.canvas.delete_object(self._shape_obj)
             self._shape_obj = None
 
     def close(self):
         self.clear()
-        self._tool.close()
+        if self._tool is not None:
+            self._tool.close()
         return super(GingaSpectrumMode, self).close()
 
 
@@ -583,16 +618,12 @@ class GingaPVSlicerMode(GingaROIMode):
 
     def set_roi_tool(self, mode):
         self._shape = mode
-        self.viewer._set_roi_mode(self, mode, 'draw',
-                                  color='red', linewidth=2, linestyle='solid',
-                                  fill=False, alpha=1.0)
+        self.viewer._set_roi_mode(self, mode, 'draw', **_EXTRACT_STYLE)
 
     def _clear_path(self):
         if self._path_obj is not None:
-            try:
-                self.viewer.canvas.delete_object(self._path_obj)
-            except:
-                pass
+            # a no-op if the shape was already removed from the canvas
+            self.viewer.canvas.delete_object(self._path_obj)
             self._path_obj = None
 
     def activate(self):
@@ -0,0 +1,44 @@
+from __future__ import absolute_import, division, print_function
+
+import numpy as np
+import pytest
+
+pytest.importorskip('ginga')
+
+from glue.utils import color2rgb
+
+from ..layer_artist import SubsetImage
+
+
+class FakeLayerState(object):
+    color = '#336699'
+
+
+def rgb_from_mask_dstack(color, mask):
+    # the original implementation, which the packed version must match
+    r, g, b = color2rgb(color)
+    ones = mask * 0 + 255
+    alpha = mask * 127
+    result = np.dstack((ones * r, ones * g, ones * b, alpha)).astype(np.uint8)
+    return result
+
+
+def subset_image():
+    # skip BaseImage.__init__, which needs a full glue layer state
+    image = SubsetImage.__new__(SubsetImage)
+    image.layer_state = FakeLayerState()
+    image._pixel_cache = (None, None)
+    return image
+
+
+@pytest.mark.parametrize('mask', [np.array([[True, False, True],
+                                            [False, False, True]]),
+                                  np.array([[True, False, True],
+                                            [False, False, True]]).T,
+                                  np.array(True), np.array(False)])
+def test_rgb_from_mask(mask):
+    expected = rgb_from_mask_dstack(FakeLayerState.color, mask)
+    result = subset_image()._rgb_from_mask(mask)
+    assert result.dtype == np.uint8
+    assert result.shape == expected.shape
+    np.testing.assert_array_equal(result, expected)
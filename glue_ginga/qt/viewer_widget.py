@@ -2,7 +2,7 @@ from __future__ import absolute_import, division, print_function
 
 import os
 
-from qtpy import QtWidgets, PYQT5
+from qtpy import QtCore, QtWidgets, PYQT5
 
 from ginga.misc import log
 from ginga import toolkit
@@ -74,6 +74,9 @@ class GingaViewer(DataViewerWithState):
                                       bindings=bd)
         self.canvas = self.viewer
 
+        # arguments shared by every layer artist made for this viewer
+        self._artist_kwargs = dict(canvas=self.canvas, viewer_state=self.state)
+
         # prevent widget from grabbing focus
         self.viewer.set_enter_focus(False)
         self.viewer.set_desired_size(300, 300)
@@ -82,9 +85,11 @@ class GingaViewer(DataViewerWithState):
         bindings = self.viewer.get_bindings()
         bindings.enable_all(True)
         self.canvas.register_for_cursor_drawing(self.viewer)
-        self.canvas.add_callback('draw-event', self._apply_roi_cb)
-        self.canvas.add_callback('edit-event', self._update_roi_cb)
-        self.canvas.add_callback('draw-down', self._clear_roi_cb)
+        # ROI callbacks are connected only while a drawing mode is active
+        self._roi_callbacks = (('draw-event', self._apply_roi_cb),
+                               ('edit-event', self._update_roi_cb),
+                               ('draw-down', self._clear_roi_cb))
+        self._roi_callbacks_connected = False
         self.canvas.enable_draw(False)
         self.canvas.enable_edit(False)
         self.viewer.enable_autozoom('off')
@@ -97,6 +102,14 @@ class GingaViewer(DataViewerWithState):
         self.mode_w = None
         self.mode_actns = {}
 
+        # colorbar updates arrive on every mouse move while adjusting cuts
+        # or contrast, so they are applied at most every 50 ms
+        self._colorbar_rgbmap_changed = False
+        self._colorbar_timer = QtCore.QTimer(self)
+        self._colorbar_timer.setSingleShot(True)
+        self._colorbar_timer.setInterval(50)
+        self._colorbar_timer.timeout.connect(self._flush_colorbar)
+
         # Create settings and set defaults
         settings = self.viewer.get_settings()
         self.settings = settings
@@ -134,13 +147,20 @@ class GingaViewer(DataViewerWithState):
 
         self._crosshair_id = '_crosshair'
 
+        # crosshair moves arrive in bursts while dragging, so only the
+        # latest position is drawn, at most every 30 ms
+        self._pending_crosshair = None
+        self._crosshair_timer = QtCore.QTimer(self)
+        self._crosshair_timer.setSingleShot(True)
+        self._crosshair_timer.setInterval(30)
+        self._crosshair_timer.timeout.connect(self._flush_crosshairs)
+
         self.setCentralWidget(topw)
 
     def get_layer_artist(self, cls, layer=None, layer_state=None):
         if layer_state is not None and layer_state.viewer_state is None:
             layer_state.viewer_state = self.state
-        return cls(layer=layer, layer_state=layer_state,
-                   canvas=self.canvas, viewer_state=self.state)
+        return cls(layer=layer, layer_state=layer_state, **self._artist_kwargs)
 
     def match_colorbar(self, canvas, colorbar):
         rgbmap = self.viewer.get_rgbmap()
@@ -149,29 +169,51 @@ class GingaViewer(DataViewerWithState):
         colorbar.set_rgbmap(rgbmap)
 
     def rgbmap_cb(self, rgbmap, canvas):
-        self.match_colorbar(canvas, self.colorbar)
+        self._colorbar_rgbmap_changed = True
+        self._schedule_colorbar()
 
     def cut_levels_cb(self, setting, tup):
-        (loval, hival) = tup
-        self.colorbar.set_range(loval, hival)
+        self._schedule_colorbar()
+
+    def _schedule_colorbar(self):
+        if not self._colorbar_timer.isActive():
+            self._colorbar_timer.start()
+
+    def _flush_colorbar(self):
+        if self._colorbar_rgbmap_changed:
+            self._colorbar_rgbmap_changed = False
+            self.match_colorbar(self.viewer, self.colorbar)
+        else:
+            loval, hival = self.viewer.get_cut_levels()
+            self.colorbar.set_range(loval, hival)
 
     def _set_roi_mode(self, opn_obj, name, mode, **kwargs):
         self.opn_obj = opn_obj
         en_draw = (mode == 'draw')
+        self._connect_roi_callbacks(en_draw)
         self.canvas.enable_draw(en_draw)
         self.canvas.set_draw_mode(mode)
         # XXX need better way of setting draw contexts
         self.canvas.draw_context = self
         self.canvas.set_drawtype(name, **kwargs)
 
+    def _connect_roi_callbacks(self, connect):
+        # keeps the canvas from dispatching to the ROI callbacks at all
+        # while panning, zooming, etc.
+        if connect == self._roi_callbacks_connected:
+            return
+        for name, callback in self._roi_callbacks:
+            if connect:
+                self.canvas.add_callback(name, callback)
+            else:
+                self.canvas.remove_callback(name, callback)
+        self._roi_callbacks_connected = connect
+
     def _clear_roi_cb(self, canvas, *args):
         if self.opn_obj is not None:
             self.opn_obj.opn_init(self, self.roi_tag)
-        else:
-            try:
-                self.canvas.delete_object_by_tag(self.roi_tag)
-            except:
-                pass
+        elif self.roi_tag is not None and self.canvas.has_tag(self.roi_tag):
+            self.canvas.delete_object_by_tag(self.roi_tag, redraw=False)
 
     def _apply_roi_cb(self, canvas, tag):
         if self.canvas.draw_context is not self:
@@ -230,15 +272,32 @@ class GingaViewer(DataViewerWithState):
         self.canvas.set_cmap(cmap)
 
     def show_crosshairs(self, x, y):
-        self.clear_crosshairs()
+        self._pending_crosshair = (x, y)
+        if not self._crosshair_timer.isActive():
+            self._crosshair_timer.start()
+
+    def _flush_crosshairs(self):
+        if self._pending_crosshair is None:
+            return
+        x, y = self._pending_crosshair
+        self._pending_crosshair = None
+        if self.canvas.has_tag(self._crosshair_id):
+            # move the existing marker, with a single overlay redraw
+            c = self.canvas.get_object_by_tag(self._crosshair_id)
+            if (c.x, c.y) == (x, y):
+                # already there, e.g. the mouse moved within a pixel
+                return
+            c.x, c.y = x, y
+            self.canvas.update_canvas(whence=3)
+            return
         c = self.canvas.viewer.get_draw_class('point')(x, y, 6, color='red', style='plus')
         self.canvas.add(c, tag=self._crosshair_id, redraw=True)
 
     def clear_crosshairs(self):
-        try:
-            self.canvas.delete_objects_by_tag([self._crosshair_id], redraw=False)
-        except:
-            pass
+        self._pending_crosshair = None
+        self._crosshair_timer.stop()
+        if self.canvas.has_tag(self._crosshair_id):
+            self.canvas.delete_object_by_tag(self._crosshair_id, redraw=False)
 
     def apply_roi(self, roi):
         cmd = command.ApplyROI(data_collection=self._data,